@@ -0,0 +1,163 @@
+import json
+import os
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from club import Club
+
+# Daily activity per club, stored as one dense int32 array of shape
+# (metric, club, day) so a date window is a contiguous slice along the last axis.
+#
+# A few hundred clubs over five years is small: 4 metrics x 300 clubs x 1826
+# days x 4 bytes ~= 8.8 MB raw, typically well under 1 MB as .npz since most
+# days are empty. Run `python activity.py` for load and slice timings.
+
+METRICS = ('messages', 'posts', 'likes', 'active_senders')
+DEFAULT_CUBE_FILE = "club_activity.npz"
+
+DateLike = Union[date, str]
+
+def _as_date(value: DateLike) -> date:
+    if isinstance(value, str):
+        return date.fromisoformat(value)
+    return value.date() if hasattr(value, 'date') else value
+
+class ActivityCube:
+    def __init__(self, data: np.ndarray, start: date, club_keys: Sequence[str], club_names: Optional[Sequence[str]] = None):
+        self.data = data
+        self.start = start
+        self.club_keys = list(club_keys)
+        self.club_names = list(club_names) if club_names is not None else list(club_keys)
+        self._club_index = {key: i for i, key in enumerate(self.club_keys)}
+
+    @property
+    def num_days(self) -> int:
+        return self.data.shape[2]
+
+    @property
+    def end(self) -> date:
+        return self.start + timedelta(days=self.num_days - 1)
+
+    def dates(self) -> List[date]:
+        return [self.start + timedelta(days=i) for i in range(self.num_days)]
+
+    @classmethod
+    def from_clubs(cls, clubs: List[Club]) -> 'ActivityCube':
+        days = set()
+        for club in clubs:
+            days.update(club.daily_messages)
+            days.update(d.date() for d in club.post_dates)
+        start = min(days) if days else date.today()
+        num_days = (max(days) - start).days + 1 if days else 0
+
+        data = np.zeros((len(METRICS), len(clubs), num_days), dtype=np.int32)
+        messages, posts, likes, senders = range(len(METRICS))  # same order as METRICS
+        for c, club in enumerate(clubs):
+            for day, n in club.daily_messages.items():
+                data[messages, c, (day - start).days] = n
+            for day, n in club.daily_active_senders.items():
+                data[senders, c, (day - start).days] = n
+            # Older checkpoints have dates without per-post likes; count the posts anyway
+            post_likes = club.post_likes if len(club.post_likes) == len(club.post_dates) else [0] * len(club.post_dates)
+            for posted, n in zip(club.post_dates, post_likes):
+                i = (posted.date() - start).days
+                data[posts, c, i] += 1
+                data[likes, c, i] += n
+
+        return cls(data, start, [club.insta_handle for club in clubs], [club.name.strip() for club in clubs])
+
+    def _day(self, value: DateLike, offset: int = 0) -> int:
+        # Clamp after applying the offset, so an end date before the cube starts still gives an empty window
+        return min(max((_as_date(value) - self.start).days + offset, 0), self.num_days)
+
+    def window(self, metric: str, start: Optional[DateLike] = None, end: Optional[DateLike] = None) -> np.ndarray:
+        """(club, day) slice of one metric for start..end inclusive; a view, nothing is copied"""
+        lo = self._day(start) if start is not None else 0
+        hi = self._day(end, offset=1) if end is not None else self.num_days
+        return self.data[METRICS.index(metric), :, lo:max(hi, lo)]
+
+    def range_sum(self, metric: str, start: Optional[DateLike] = None, end: Optional[DateLike] = None) -> Dict[str, int]:
+        totals = self.window(metric, start, end).sum(axis=1)
+        return {key: int(total) for key, total in zip(self.club_keys, totals)}
+
+    def club_series(self, club_key: str, metric: str) -> np.ndarray:
+        return self.data[METRICS.index(metric), self._club_index[club_key]]
+
+    def save(self, path: str = DEFAULT_CUBE_FILE) -> str:
+        """Write a compressed .npz, or a raw .npy (plus .json sidecar) that load() can memory-map"""
+        meta = {
+            'start': self.start.isoformat(),
+            'metrics': list(METRICS),
+            'club_keys': self.club_keys,
+            'club_names': self.club_names
+        }
+        if path.endswith('.npy'):
+            np.save(path, self.data)
+            with open(path + '.json', 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+        else:
+            np.savez_compressed(path, data=self.data, meta=np.array(json.dumps(meta, ensure_ascii=False)))
+        return path
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_CUBE_FILE, mmap: bool = True) -> 'ActivityCube':
+        if path.endswith('.npy'):
+            data = np.load(path, mmap_mode='r' if mmap else None)
+            with open(path + '.json', 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        else:
+            with np.load(path) as archive:
+                data = archive['data']
+                meta = json.loads(str(archive['meta']))
+        if tuple(meta['metrics']) != METRICS:
+            raise ValueError(f"{path} holds metrics {meta['metrics']}, expected {list(METRICS)}")
+        return cls(data, date.fromisoformat(meta['start']), meta['club_keys'], meta['club_names'])
+
+if __name__ == '__main__':
+    # Timings for a few hundred clubs over five years of synthetic, mostly idle activity
+    import tempfile
+    import time
+
+    num_clubs, num_days = 300, 5 * 365 + 1
+    rng = np.random.default_rng(0)
+    data = np.zeros((len(METRICS), num_clubs, num_days), dtype=np.int32)
+    active = rng.random((num_clubs, num_days)) < 0.3
+    data[0] = np.where(active, rng.poisson(20, (num_clubs, num_days)), 0)
+    data[1] = rng.random((num_clubs, num_days)) < 0.02
+    data[2] = data[1] * rng.poisson(150, (num_clubs, num_days))
+    data[3] = np.minimum(data[0], rng.poisson(6, (num_clubs, num_days)))
+    cube = ActivityCube(data, date(2021, 1, 1), [f"club_{i}" for i in range(num_clubs)])
+
+    def best_of(fn, repeat=5):
+        times = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - t0)
+        return min(times)
+
+    # Windows partly or entirely outside the cube only count the days inside it
+    zeros = {key: 0 for key in cube.club_keys}
+    assert cube.range_sum('messages', '2000-01-01', '2000-02-01') == zeros, "window before the cube must be empty"
+    assert cube.range_sum('messages', '2030-01-01', '2030-02-01') == zeros, "window after the cube must be empty"
+    assert cube.range_sum('messages', '2000-01-01', '2020-12-31') == zeros, "window ending the day before the cube must be empty"
+    first_day = {key: int(n) for key, n in zip(cube.club_keys, data[0, :, 0])}
+    assert cube.range_sum('messages', '2000-01-01', '2021-01-01') == first_day
+    assert cube.range_sum('messages', '2020-06-01', '2030-01-01') == cube.range_sum('messages')
+    assert cube.range_sum('messages', '2023-05-31', '2023-03-01') == zeros, "reversed window must be empty"
+
+    print(f"--- {num_clubs} clubs x {num_days} days x {len(METRICS)} metrics ({data.nbytes / 1e6:.1f} MB raw) ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ('cube.npz', 'cube.npy'):
+            path = os.path.join(tmp, name)
+            cube.save(path)
+            size = os.path.getsize(path) / 1e6
+            load_time = best_of(lambda: ActivityCube.load(path))
+            loaded = ActivityCube.load(path)
+            slice_time = best_of(lambda: loaded.range_sum('messages', '2023-03-01', '2023-05-31'), repeat=50)
+            full_time = best_of(lambda: loaded.range_sum('likes'), repeat=50)
+            assert loaded.range_sum('likes') == cube.range_sum('likes')
+            print(f"{name}: {size:5.1f} MB on disk, load {load_time * 1e3:6.1f} ms, "
+                  f"92-day range sum {slice_time * 1e3:.2f} ms, full-range sum {full_time * 1e3:.2f} ms")
@@ -0,0 +1,98 @@
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Set, Tuple
+
+# Phrases that only really appear when a club is announcing something. Matched
+# case-insensitively as whole words. Single everyday words ("tomorrow", "event",
+# "session") are deliberately left out: in an active group they fire every few
+# days and would mark nearly every Instagram event as corroborated.
+DEFAULT_ANNOUNCEMENT_KEYWORDS: Tuple[str, ...] = (
+    "registrations open",
+    "registrations are open",
+    "registration link",
+    "registration form",
+    "registration deadline",
+    "register now",
+    "register here",
+    "last date to register",
+    "save the date",
+    "auditions open",
+    "workshop tomorrow",
+    "workshop today",
+    "event tomorrow",
+    "event today",
+    "session tomorrow",
+    "session today",
+    "reporting time",
+    "open to all",
+    "rsvp",
+)
+
+WORD_PATTERN = re.compile(r"\w+(?:'\w+)*")
+
+def tokenize(text: str) -> List[str]:
+    return WORD_PATTERN.findall(text.lower().replace("\u2019", "'"))
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton matching every keyword in one left-to-right scan of the text.
+
+    The alphabet is words rather than characters: the regex tokenizer runs in C,
+    keywords only ever match on word boundaries, and the Python loop takes one
+    step per word instead of one per character.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = tuple(dict.fromkeys(" ".join(tokenize(k)) for k in keywords if tokenize(k)))
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]  # state -> indexes of keywords ending here
+
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for word in keyword.split(" "):
+                nxt = self._goto[state].get(word)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][word] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(index)
+
+        # Breadth-first so every state's failure link is final before its children need it.
+        # Depth-1 states keep failing to the root.
+        queue = deque(self._goto[0].values())
+        order = list(queue)
+        while queue:
+            state = queue.popleft()
+            for word, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and word not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(word, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+                order.append(nxt)
+
+        # Fold the failure links into a full transition table, so scanning is one dict lookup per word
+        self._delta: List[Dict[str, int]] = [{} for _ in self._goto]
+        self._delta[0] = dict(self._goto[0])
+        for state in order:
+            self._delta[state] = {**self._delta[self._fail[state]], **self._goto[state]}
+
+    def find(self, text: str) -> Set[str]:
+        """Keywords that occur in text"""
+        found = set()
+        state = 0
+        delta, out = self._delta, self._out
+        for word in tokenize(text):
+            state = delta[state].get(word, 0)
+            if out[state]:
+                found.update(self.keywords[index] for index in out[state])
+        return found
+
+@lru_cache(maxsize=8)
+def build_automaton(keywords: Tuple[str, ...] = DEFAULT_ANNOUNCEMENT_KEYWORDS) -> KeywordAutomaton:
+    return KeywordAutomaton(keywords)
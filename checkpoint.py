@@ -0,0 +1,140 @@
+import base64
+import json
+import os
+import re
+import tempfile
+from datetime import date, datetime
+from typing import Dict, Optional
+from club import Club
+from sketches import MinHash, HyperLogLog
+
+CHECKPOINT_DIR = "checkpoints"
+
+def checkpoint_path(club: Club, directory: str = CHECKPOINT_DIR) -> str:
+    # The handle keeps two clubs with the same display name apart
+    slug = re.sub(r'[^A-Za-z0-9_-]+', '_', f"{club.name.strip()}_{club.insta_handle}").strip('_')
+    return os.path.join(directory, f"{slug}.json")
+
+def _to_iso(dt: Optional[datetime]) -> Optional[str]:
+    return dt.isoformat() if dt else None
+
+def _from_iso(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+def _daily_to_json(counts: Dict[date, int]) -> Dict[str, int]:
+    return {day.isoformat(): n for day, n in counts.items()}
+
+def _daily_from_json(value: Optional[Dict[str, int]]) -> Dict[date, int]:
+    return {date.fromisoformat(day): n for day, n in (value or {}).items()}
+
+def _minhash_to_json(sketch: Optional[MinHash]) -> Optional[Dict]:
+    return {'k': sketch.k, 'mins': sketch.mins} if sketch else None
+
+def _minhash_from_json(value: Optional[Dict]) -> Optional[MinHash]:
+    return MinHash(value['k'], value['mins']) if value else None
+
+def _hll_to_json(sketch: Optional[HyperLogLog]) -> Optional[Dict]:
+    return {'p': sketch.p, 'registers': base64.b64encode(bytes(sketch.registers)).decode('ascii')} if sketch else None
+
+def _hll_from_json(value: Optional[Dict]) -> Optional[HyperLogLog]:
+    return HyperLogLog(value['p'], base64.b64decode(value['registers'])) if value else None
+
+def club_to_checkpoint(club: Club) -> Dict:
+    return {
+        'name': club.name,
+        'insta_handle': club.insta_handle,
+        'whatsapp_files': club.whatsapp_files,
+        'instagram': {
+            'num_posts': club.num_posts,
+            'likes_sum': club.likes_sum,
+            'comments_sum': club.comments_sum,
+            'followers': club.followers,
+            'post_dates': [_to_iso(d) for d in club.post_dates],
+            'post_likes': club.post_likes
+        },
+        'whatsapp': {
+            'total_messages': club.total_messages,
+            'num_participants': club.num_participants,
+            'first_msg_date': _to_iso(club.first_msg_date),
+            'last_msg_date': _to_iso(club.last_msg_date),
+            'duplicate_messages': club.duplicate_messages,
+            'duplicate_bytes': club.duplicate_bytes,
+            'member_minhash': _minhash_to_json(club.member_minhash),
+            'member_hll': _hll_to_json(club.member_hll),
+            'announcement_dates': [_to_iso(d) for d in club.announcement_dates],
+            'daily_messages': _daily_to_json(club.daily_messages),
+            'daily_active_senders': _daily_to_json(club.daily_active_senders)
+        },
+        'events': [
+            {
+                'start_date': _to_iso(e['start_date']),
+                'end_date': _to_iso(e['end_date']),
+                'num_posts': e['num_posts'],
+                'corroborated': e.get('corroborated', False)
+            }
+            for e in club.events
+        ],
+        'composite_score': club.composite_score
+    }
+
+def save_club_checkpoint(club: Club, directory: str = CHECKPOINT_DIR) -> str:
+    """Atomically write a finished club's metrics so a later --resume can skip it"""
+    os.makedirs(directory, exist_ok=True)
+    path = checkpoint_path(club, directory)
+
+    # Write to a temp file in the same directory and rename over the target,
+    # so a crash mid-write never leaves a half-written checkpoint behind
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(club_to_checkpoint(club), f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+def load_club_checkpoint(club: Club, directory: str = CHECKPOINT_DIR) -> bool:
+    """Restore a club from its checkpoint. Returns False if there is no usable checkpoint."""
+    path = checkpoint_path(club, directory)
+    if not os.path.exists(path):
+        return False
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    # A checkpoint made from a different chat export is stale
+    if data.get('whatsapp_files') != club.whatsapp_files:
+        return False
+
+    instagram = dict(data.get('instagram', {}))
+    instagram['post_dates'] = [_from_iso(d) for d in instagram.get('post_dates', [])]
+    club.update_instagram_metrics(instagram)
+
+    whatsapp = dict(data.get('whatsapp', {}))
+    whatsapp['first_msg_date'] = _from_iso(whatsapp.get('first_msg_date'))
+    whatsapp['last_msg_date'] = _from_iso(whatsapp.get('last_msg_date'))
+    whatsapp['member_minhash'] = _minhash_from_json(whatsapp.get('member_minhash'))
+    whatsapp['member_hll'] = _hll_from_json(whatsapp.get('member_hll'))
+    whatsapp['announcement_dates'] = [_from_iso(d) for d in whatsapp.get('announcement_dates', [])]
+    whatsapp['daily_messages'] = _daily_from_json(whatsapp.get('daily_messages'))
+    whatsapp['daily_active_senders'] = _daily_from_json(whatsapp.get('daily_active_senders'))
+    club.update_whatsapp_metrics(whatsapp)
+
+    club.events = [
+        {
+            'start_date': _from_iso(e['start_date']),
+            'end_date': _from_iso(e['end_date']),
+            'num_posts': e['num_posts'],
+            'corroborated': e.get('corroborated', False)
+        }
+        for e in data.get('events', [])
+    ]
+    club.composite_score = data.get('composite_score', 0)
+    return True
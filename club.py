@@ -1,11 +1,14 @@
-from typing import List
-from datetime import datetime
+from typing import Dict, List, Optional, Union
+from datetime import date, datetime
+from sketches import MinHash, HyperLogLog
 
 class Club:
-    def __init__(self, name: str, insta_handle: str, whatsapp_file: str, category: str = "uncategorized"):
+    def __init__(self, name: str, insta_handle: str, whatsapp_file: Union[str, List[str]], category: str = "uncategorized"):
         self.name = name
         self.insta_handle = insta_handle
         self.whatsapp_file = whatsapp_file
+        # Several overlapping exports of the same group (different phones/dates) are merged and deduplicated
+        self.whatsapp_files: List[str] = [whatsapp_file] if isinstance(whatsapp_file, str) else list(whatsapp_file)
         self.category = category
 
         # This will be the initial placeholders for our metrics
@@ -14,11 +17,19 @@ class Club:
         self.comments_sum = 0
         self.followers = 0
         self.post_dates: List[datetime] = []
+        self.post_likes: List[int] = []  # likes per post, aligned with post_dates
 
         self.total_messages = 0
         self.num_participants = 0
         self.first_msg_date = None
         self.last_msg_date = None
+        self.duplicate_messages = 0
+        self.duplicate_bytes = 0
+        self.member_minhash: Optional[MinHash] = None  # sketches of the participant set, see sketches.py
+        self.member_hll: Optional[HyperLogLog] = None
+        self.announcement_dates: List[datetime] = []  # messages matching an announcement keyword
+        self.daily_messages: Dict[date, int] = {}
+        self.daily_active_senders: Dict[date, int] = {}
         self.events: List[dict] = [] 
 
         self.composite_score = 0  #The final score which   will be calculated later based on which rankings can be determined
@@ -30,9 +41,17 @@ class Club:
         self.comments_sum = insta_metrics.get("comments_sum", 0)
         self.followers = insta_metrics.get("followers", 0)
         self.post_dates = insta_metrics.get("post_dates", [])
+        self.post_likes = insta_metrics.get("post_likes", [])
 
     def update_whatsapp_metrics(self, whatsapp_metrics: dict):
         self.total_messages = whatsapp_metrics.get("total_messages", 0)
         self.num_participants = whatsapp_metrics.get("num_participants", 0)
         self.first_msg_date = whatsapp_metrics.get("first_msg_date")
         self.last_msg_date = whatsapp_metrics.get("last_msg_date")
+        self.duplicate_messages = whatsapp_metrics.get("duplicate_messages", 0)
+        self.duplicate_bytes = whatsapp_metrics.get("duplicate_bytes", 0)
+        self.member_minhash = whatsapp_metrics.get("member_minhash")
+        self.member_hll = whatsapp_metrics.get("member_hll")
+        self.announcement_dates = whatsapp_metrics.get("announcement_dates", [])
+        self.daily_messages = whatsapp_metrics.get("daily_messages", {})
+        self.daily_active_senders = whatsapp_metrics.get("daily_active_senders", {})
@@ -1,11 +1,133 @@
-from typing import List, Dict
+import heapq
+import itertools
+from typing import List, Dict, Iterable, Optional
 from club import Club
 
+CATEGORY_SEPARATOR = "/"
+
+def category_path(category: Optional[str]) -> List[str]:
+    # "Entertainment/Music" -> ["Entertainment", "Entertainment/Music"] so each club rolls up into its parents
+    parts = [p.strip() for p in (category or "").split(CATEGORY_SEPARATOR) if p.strip()]
+    if not parts:
+        parts = ["uncategorized"]
+    return [CATEGORY_SEPARATOR.join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+class CategoryStats:
+    """Running count, sum, mean and top club for one category node"""
+
+    def __init__(self, name: str, live: Dict[Club, int]):
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.members: Dict[Club, float] = {}  # insertion ordered, club -> score it was counted with
+        self._heap: list = []  # (-score, seq, club), stale entries are dropped lazily
+        self._live = live  # shared with the index: club -> seq of its current heap entries
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def clubs(self) -> List[Club]:
+        return list(self.members)
+
+    @property
+    def top(self) -> Optional[Club]:
+        while self._heap:
+            neg_score, seq, club = self._heap[0]
+            if self._live.get(club) == seq:
+                return club
+            heapq.heappop(self._heap)
+        return None
+
+    def _add(self, club: Club, score: float, seq: int):
+        self.members[club] = score
+        self.count += 1
+        self.total += score
+        heapq.heappush(self._heap, (-score, seq, club))
+
+    def _remove(self, club: Club):
+        self.total -= self.members.pop(club)
+        self.count -= 1
+        if self.count == 0:
+            self.total = 0.0  # drop any float drift once the category is empty
+
+    def _rescore(self, club: Club, score: float, seq: int):
+        self.total += score - self.members[club]
+        self.members[club] = score
+        heapq.heappush(self._heap, (-score, seq, club))
+        # Lazy deletion leaves old entries behind; rebuild once they dominate the heap
+        if len(self._heap) > 2 * self.count + 16:
+            self._heap = [(-s, self._live[c], c) for c, s in self.members.items()]
+            heapq.heapify(self._heap)
+
+class CategoryIndex:
+    """Category -> aggregates, built once and kept current as club scores change.
+
+    Adding, removing or re-scoring a club touches only the categories on its
+    path, each in O(log n). Hierarchical categories ("Entertainment/Music")
+    are rolled up into every parent ("Entertainment").
+    """
+
+    def __init__(self, clubs: Iterable[Club] = ()):
+        self._stats: Dict[str, CategoryStats] = {}
+        self._paths: Dict[Club, List[str]] = {}
+        self._live: Dict[Club, int] = {}  # club -> seq of its current heap entries
+        self._seq = itertools.count()
+        for club in clubs:
+            self.add(club)
+
+    def __contains__(self, category: str) -> bool:
+        return category in self._stats
+
+    def __len__(self) -> int:
+        return len(self._stats)
+
+    def __getitem__(self, category: str) -> CategoryStats:
+        return self._stats[category]
+
+    def get(self, category: str) -> Optional[CategoryStats]:
+        return self._stats.get(category)
+
+    def categories(self) -> List[str]:
+        # Tree order: each parent followed by its children, siblings in first-seen order
+        order = {name: i for i, name in enumerate(self._stats)}
+        return sorted(self._stats, key=lambda name: [order[p] for p in category_path(name)])
+
+    def top_level(self) -> List[str]:
+        return [c for c in self._stats if CATEGORY_SEPARATOR not in c]
+
+    def groups(self) -> Dict[str, List[Club]]:
+        return {name: self._stats[name].clubs for name in self.categories()}
+
+    def add(self, club: Club):
+        if club in self._paths:
+            raise ValueError(f"{club.name} is already indexed")
+        path = category_path(club.category)
+        seq = next(self._seq)
+        self._paths[club] = path
+        self._live[club] = seq
+        for name in path:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = CategoryStats(name, self._live)
+            stats._add(club, club.normalized_score, seq)
+
+    def remove(self, club: Club):
+        for name in self._paths.pop(club):
+            stats = self._stats[name]
+            stats._remove(club)
+            if stats.count == 0:
+                del self._stats[name]
+        del self._live[club]
+
+    def update_score(self, club: Club, score: float):
+        """Set club.normalized_score and update every category it belongs to"""
+        club.normalized_score = score
+        seq = next(self._seq)
+        self._live[club] = seq
+        for name in self._paths[club]:
+            self._stats[name]._rescore(club, score, seq)
+
 def group_clubs_by_category(clubs: List[Club]) -> Dict[str, List[Club]]:
-    groups: Dict[str, List[Club]] = {}
-    for club in clubs:
-        cat = club.category or "uncategorized" # based on the initial category
-        if cat not in groups:
-            groups[cat] = []
-        groups[cat].append(club)
-    return groups
\ No newline at end of file
+    return CategoryIndex(clubs).groups()
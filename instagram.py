@@ -53,6 +53,7 @@ def fetch_instagram_metrics(club_handle: str, max_posts: int = 50) -> dict:
         likes_sum = 0
         comments_sum = 0
         post_dates: List[datetime] = []
+        post_likes: List[int] = []  # per post, aligned with post_dates
         post_count = 0
         
         print(f"   📊 Fetching up to {max_posts} recent posts...")
@@ -64,6 +65,7 @@ def fetch_instagram_metrics(club_handle: str, max_posts: int = 50) -> dict:
             likes_sum += post.likes
             comments_sum += post.comments
             post_dates.append(post.date_utc)
+            post_likes.append(post.likes)
             post_count += 1
             
             # Rate limiting: sleep between each post fetch. This worked the very first time but then proceeded to not work 
@@ -81,7 +83,8 @@ def fetch_instagram_metrics(club_handle: str, max_posts: int = 50) -> dict:
             'likes_sum': likes_sum,
             'comments_sum': comments_sum,
             'followers': followers,
-            'post_dates': post_dates
+            'post_dates': post_dates,
+            'post_likes': post_likes
         }
 
     except instaloader.exceptions.ProfileNotExistsException:
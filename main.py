@@ -1,4 +1,4 @@
-import time
+import argparse
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
@@ -7,20 +7,16 @@ from rich.text import Text
 from rich.align import Align
 from rich import box
 
-from club import Club
-from instagram import fetch_instagram_metrics
-from whatsapp import parse_whatsapp_chat
-from grouping import group_clubs_by_category
-from metrics import (
-    compute_composite_score, 
-    cluster_posts_into_events, 
-    compute_final_score_with_events,
-    normalize_scores
-)
+from grouping import CategoryIndex
+from checkpoint import CHECKPOINT_DIR, load_club_checkpoint
+from metrics import normalize_scores
+from pipeline import build_clubs, process_club
+from server import DEFAULT_HOST, DEFAULT_PORT
 from typing import List, Dict
-from visualizer import show_visualizations, save_visualizations, print_terminal_summary
+from visualizer import show_visualizations, save_visualizations, print_terminal_summary, print_membership_overlap, save_activity_timeline
+from activity import ActivityCube, DEFAULT_CUBE_FILE
 
-def main():
+def main(resume: bool = False, checkpoint_dir: str = CHECKPOINT_DIR):
     console = Console()
     
     # Create welcome panel
@@ -34,33 +30,7 @@ def main():
     console.print(welcome_panel)
     console.print()
     
-    clubs = [
-        Club(
-            name="Coding Club ", 
-            insta_handle="snuc_cc",  
-            whatsapp_file="/home/ammog/Desktop/testData/WhatsApp Chat with SNUCCC Discussions.txt", 
-            category="Tech"  
-        ),
-        Club(
-            name="Music Club",
-            insta_handle="snuc_isai",
-            whatsapp_file="/home/ammog/Desktop/testData/WhatsApp Chat with 🎶ISAI'24🎶.txt",
-            category="Entertainment"
-        ),
-        Club(
-            name="QUiz Club",
-            insta_handle="snuc_cognitionquiz",
-            whatsapp_file="/home/ammog/Desktop/testData/WhatsApp Chat with Cognition - The SNUC Quiz Club.txt",
-            category="Entertainment"
-        ),
-        Club(
-            name="Dance Club",
-            insta_handle="snuc_rhythm",
-            whatsapp_file="/home/ammog/Desktop/testData/WhatsApp Chat with Rhythm - SNU.txt",
-            category="Entertainment"
-        )
-        
-    ]
+    clubs = build_clubs()
     
     console.print(f"[green]📋 Created {len(clubs)} club objects[/green]")
     console.print()
@@ -86,52 +56,14 @@ def main():
                 box=box.SIMPLE
             )
             console.print(club_panel)
-        
-            console.print(f"[blue]📱 Fetching Instagram metrics for @{club.insta_handle}[/blue]")
-            try:
-                insta_metrics = fetch_instagram_metrics(club.insta_handle)
-                if insta_metrics:
-                    club.update_instagram_metrics(insta_metrics)
-                    console.print(f"   [green]✅ Instagram: {club.num_posts} posts, {club.followers:,} followers[/green]")
-                    
-                else:
-                    console.print(f"   [red]❌ Failed to fetch Instagram metrics for @{club.insta_handle}[/red]")
-            except Exception as e:
-                console.print(f"   [red]❌ Instagram error: {e}[/red]")
-            time.sleep(15)
             
-            console.print(f"[purple]💬 Parsing WhatsApp chat[/purple]")
-            try:
-                whatsapp_metrics = parse_whatsapp_chat(club.whatsapp_file)
-                if whatsapp_metrics:
-                    club.update_whatsapp_metrics(whatsapp_metrics)
-                    console.print(f"   [green]✅ WhatsApp: {club.total_messages:,} messages, {club.num_participants} participants[/green]")
-                else:
-                    console.print(f"   [red]❌ Failed to parse WhatsApp chat[/red]")
-            except Exception as e:
-                console.print(f"   [red]❌ WhatsApp error: {e}[/red]")
-        
-            console.print(f"[orange3]📊 Computing metrics and scores...[/orange3]")
-            try:
-                club_metrics = {
-                    'num_posts': club.num_posts,
-                    'likes_sum': club.likes_sum,
-                    'comments_sum': club.comments_sum,
-                    'followers': club.followers,
-                    'total_messages': club.total_messages,
-                    'num_participants': club.num_participants,
-                    'post_dates': club.post_dates
-                }
-                
-                events = cluster_posts_into_events(club.post_dates)
-                club.events = events
-                
-                club.composite_score = compute_final_score_with_events(club_metrics, events)
-                
-                console.print(f"   [green]✅ Score: {club.composite_score:.2f}, Events: {len(events)}[/green]")
-                
-            except Exception as e:
-                console.print(f"   [red]❌ Metrics computation error: {e}[/red]")
+            if resume and load_club_checkpoint(club, checkpoint_dir):
+                console.print(f"   [green]♻️  Resumed from checkpoint: Score {club.composite_score:.2f}, Events: {len(club.events)}[/green]")
+                progress.advance(task)
+                console.print()
+                continue
+            
+            process_club(club, console, checkpoint_dir)
             
             progress.advance(task)
             console.print()
@@ -140,13 +72,14 @@ def main():
     all_scores = [club.composite_score for club in clubs]
     normalized_scores = normalize_scores(all_scores)
     
+    console.print(f"[cyan]📂 Grouping clubs by category...[/cyan]")
+    # Built once and shared by every category view below; score updates keep it current
+    category_index = CategoryIndex(clubs)
     for club, norm_score in zip(clubs, normalized_scores):
-        club.normalized_score = norm_score
+        category_index.update_score(club, norm_score)
     
     clubs_sorted = sorted(clubs, key=lambda c: c.normalized_score, reverse=True)
-    
-    console.print(f"[cyan]📂 Grouping clubs by category...[/cyan]")
-    grouped_clubs = group_clubs_by_category(clubs)
+    grouped_clubs = category_index.groups()
     console.print()
     
     # Our Ranking Table
@@ -176,7 +109,7 @@ def main():
             str(club.num_posts),
             f"{club.followers:,}",
             f"{club.total_messages:,}",
-            str(len(club.events))
+            f"{len(club.events)} ({sum(1 for e in club.events if e.get('corroborated'))}✓)"
         )
     
     console.print(rankings_table)
@@ -195,15 +128,15 @@ def main():
     category_table.add_column("Clubs", style="white")
     category_table.add_column("Avg Score", style="green", justify="right")
     
-    for category, category_clubs in grouped_clubs.items():
-        club_list = ", ".join([f"{club.name} ({club.normalized_score:.3f})" for club in category_clubs])
-        avg_score = sum(c.normalized_score for c in category_clubs) / len(category_clubs)
+    for category in category_index.categories():
+        stats = category_index[category]
+        club_list = ", ".join([f"{club.name} ({club.normalized_score:.3f})" for club in stats.clubs])
         
         category_table.add_row(
             f"🏷️ {category.upper()}",
-            str(len(category_clubs)),
+            str(stats.count),
             club_list,
-            f"{avg_score:.3f}"
+            f"{stats.mean:.3f}"
         )
     
     console.print(category_table)
@@ -211,7 +144,7 @@ def main():
     
     # Create completion panel
     completion_text = Text("✨ Analysis Complete!", style="bold bright_green")
-    stats_text = f"📈 Processed {len(clubs)} clubs across {len(grouped_clubs)} categories"
+    stats_text = f"📈 Processed {len(clubs)} clubs across {len(category_index.top_level())} categories"
     
     completion_panel = Panel(
         Align.center(f"{completion_text}\n\n{stats_text}"),
@@ -222,12 +155,34 @@ def main():
     console.print(completion_panel)
     
     console.print(f"[cyan]📊 Generating visualizations...[/cyan]")
-    print_terminal_summary(clubs_sorted, console)
+    print_terminal_summary(clubs_sorted, console, category_index)
+    print_membership_overlap(clubs_sorted, console, category_index)
     
     save_visualizations(clubs_sorted, "club_analysis_charts.png", console)
     
+    # Daily club x metric cube, so time-based views are array slices instead of re-deriving from raw dates
+    activity_cube = ActivityCube.from_clubs(clubs_sorted)
+    activity_cube.save(DEFAULT_CUBE_FILE)
+    console.print(f"[cyan]🗓️  Saved daily activity cube ({len(clubs_sorted)} clubs × {activity_cube.num_days} days) to {DEFAULT_CUBE_FILE}[/cyan]")
+    save_activity_timeline(activity_cube, "club_activity_timeline.png", console)
+    
     
     return clubs_sorted, grouped_clubs
 
 if __name__ == "__main__":
-    ranked_clubs, categorized_clubs = main()
+    parser = argparse.ArgumentParser(description="Analyse and rank student clubs")
+    parser.add_argument("--resume", action="store_true",
+                        help="skip clubs already checkpointed by a previous run")
+    parser.add_argument("--checkpoint-dir", default=CHECKPOINT_DIR,
+                        help=f"where per-club checkpoints are written (default: {CHECKPOINT_DIR})")
+    parser.add_argument("--serve", action="store_true",
+                        help="keep the clubs loaded and serve rankings over a local JSON API")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="address to bind with --serve")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to listen on with --serve")
+    args = parser.parse_args()
+
+    if args.serve:
+        from server import serve
+        serve(build_clubs(), host=args.host, port=args.port, resume=args.resume, checkpoint_dir=args.checkpoint_dir)
+    else:
+        ranked_clubs, categorized_clubs = main(resume=args.resume, checkpoint_dir=args.checkpoint_dir)
@@ -74,6 +74,32 @@ def cluster_posts_into_events(post_dates: List[datetime], max_gap_days: int = 14
     
     return events
 
+def cluster_announcements_into_bursts(announcement_dates: List[datetime], max_gap_days: int = 3, min_messages: int = 2) -> List[Dict]:
+    # Same gap clustering as posts, but chat announcements come in tighter bursts
+    bursts = []
+    for cluster in cluster_posts_into_events(announcement_dates, max_gap_days):
+        if cluster['num_posts'] >= min_messages:
+            bursts.append({
+                'start_date': cluster['start_date'],
+                'end_date': cluster['end_date'],
+                'num_messages': cluster['num_posts']
+            })
+    return bursts
+
+def corroborate_events(events: List[Dict], bursts: List[Dict], lead_days: int = 14, trail_days: int = 2) -> List[Dict]:
+    # An Instagram event is corroborated when a chat announcement burst overlaps it,
+    # allowing for announcements going out up to lead_days before the first post
+    lead = timedelta(days=lead_days)
+    trail = timedelta(days=trail_days)
+    for event in events:
+        window_start = event['start_date'] - lead
+        window_end = event['end_date'] + trail
+        event['corroborated'] = any(
+            b['start_date'] <= window_end and b['end_date'] >= window_start
+            for b in bursts
+        )
+    return events
+
 def compute_final_score_with_events(club_metrics: ClubMetrics, events: List[Dict]) -> float:
     base_score = compute_composite_score(club_metrics)
     
@@ -85,6 +111,10 @@ def compute_final_score_with_events(club_metrics: ClubMetrics, events: List[Dict
         
         event_bonus = math.log1p(num_events) + math.log1p(avg_posts_per_event)
         
+        # Events the WhatsApp group also announced are more likely real, so reward them on top
+        num_corroborated = sum(1 for e in events if e.get('corroborated'))
+        event_bonus += math.log1p(num_corroborated)
+        
     return base_score + event_bonus
 
 def normalize_scores(scores: List[float]) -> List[float]:
@@ -156,6 +186,38 @@ if __name__ == '__main__':
     for event in events_b:
         print(f"  - Start: {event['start_date'].date()}, End: {event['end_date'].date()}, Posts: {event['num_posts']}")
         
+    announcements_a = [datetime(2025, 7, 28), datetime(2025, 7, 30), datetime(2025, 8, 19)]
+    bursts_a = cluster_announcements_into_bursts(announcements_a)
+    corroborate_events(events_a, bursts_a)
+    
+    print("\nAnnouncement bursts for Club A:")
+    for burst in bursts_a:
+        print(f"  - Start: {burst['start_date'].date()}, End: {burst['end_date'].date()}, Messages: {burst['num_messages']}")
+    print(f"Corroborated events for Club A: {sum(1 for e in events_a if e['corroborated'])}/{len(events_a)}")
+    
+    # Everyday chatter around the same events should not count as announcements
+    from announcements import build_automaton
+    automaton = build_automaton()
+    chatter = [
+        (datetime(2025, 7, 29, 18), "see you all tomorrow"),
+        (datetime(2025, 7, 30, 9), "what time is the session?"),
+        (datetime(2025, 7, 30, 21), "that event was so much fun"),
+        (datetime(2025, 7, 31, 8), "anyone going tonight?"),
+        (datetime(2025, 8, 18, 20), "is the venue the main hall?"),
+        (datetime(2025, 8, 19, 10), "tomorrow works for me"),
+    ]
+    chatter_dates = [dt for dt, text in chatter if automaton.find(text)]
+    chatter_events = corroborate_events(cluster_posts_into_events(club_a_metrics['post_dates']),
+                                        cluster_announcements_into_bursts(chatter_dates))
+    print(f"Corroborated events for Club A from ordinary chatter only: "
+          f"{sum(1 for e in chatter_events if e['corroborated'])}/{len(chatter_events)}")
+    assert not any(e['corroborated'] for e in chatter_events), "ordinary chatter should not corroborate events"
+    
+    announced = [(datetime(2025, 7, 28, 12), "Registrations open for the coding contest, register here!"),
+                 (datetime(2025, 7, 30, 9), "Reporting time is 9 AM, workshop tomorrow")]
+    announced_dates = [dt for dt, text in announced if automaton.find(text)]
+    assert len(cluster_announcements_into_bursts(announced_dates)) == 1, "real announcements should form a burst"
+        
     final_score_a = compute_final_score_with_events(club_a_metrics, events_a)
     final_score_b = compute_final_score_with_events(club_b_metrics, events_b)
     
@@ -0,0 +1,114 @@
+import time
+from typing import List
+from rich.console import Console
+
+from club import Club
+from instagram import fetch_instagram_metrics
+from whatsapp import parse_whatsapp_chat
+from checkpoint import CHECKPOINT_DIR, save_club_checkpoint
+from metrics import (
+    cluster_posts_into_events,
+    cluster_announcements_into_bursts,
+    corroborate_events,
+    compute_final_score_with_events
+)
+
+# The club set and the per-club fetch/parse/score steps, shared by the one-shot
+# report in main.py and the long-running service in server.py
+
+def build_clubs() -> List[Club]:
+    return [
+        Club(
+            name="Coding Club ", 
+            insta_handle="snuc_cc",  
+            whatsapp_file="/home/ammog/Desktop/testData/WhatsApp Chat with SNUCCC Discussions.txt", 
+            category="Tech"  
+        ),
+        Club(
+            name="Music Club",
+            insta_handle="snuc_isai",
+            whatsapp_file="/home/ammog/Desktop/testData/WhatsApp Chat with 🎶ISAI'24🎶.txt",
+            category="Entertainment"
+        ),
+        Club(
+            name="QUiz Club",
+            insta_handle="snuc_cognitionquiz",
+            whatsapp_file="/home/ammog/Desktop/testData/WhatsApp Chat with Cognition - The SNUC Quiz Club.txt",
+            category="Entertainment"
+        ),
+        Club(
+            name="Dance Club",
+            insta_handle="snuc_rhythm",
+            whatsapp_file="/home/ammog/Desktop/testData/WhatsApp Chat with Rhythm - SNU.txt",
+            category="Entertainment"
+        )
+        
+    ]
+
+def process_club(club: Club, console: Console, checkpoint_dir: str = CHECKPOINT_DIR) -> bool:
+    """Fetch, parse and score one club. Returns True if every stage succeeded."""
+    # Only clubs where every stage succeeded get checkpointed, so --resume redoes the rest
+    club_ok = True
+
+    console.print(f"[blue]📱 Fetching Instagram metrics for @{club.insta_handle}[/blue]")
+    try:
+        insta_metrics = fetch_instagram_metrics(club.insta_handle)
+        if insta_metrics:
+            club.update_instagram_metrics(insta_metrics)
+            console.print(f"   [green]✅ Instagram: {club.num_posts} posts, {club.followers:,} followers[/green]")
+
+        else:
+            club_ok = False
+            console.print(f"   [red]❌ Failed to fetch Instagram metrics for @{club.insta_handle}[/red]")
+    except Exception as e:
+        club_ok = False
+        console.print(f"   [red]❌ Instagram error: {e}[/red]")
+    time.sleep(15)
+
+    console.print(f"[purple]💬 Parsing WhatsApp chat[/purple]")
+    try:
+        whatsapp_metrics = parse_whatsapp_chat(club.whatsapp_files)
+        if whatsapp_metrics:
+            club.update_whatsapp_metrics(whatsapp_metrics)
+            console.print(f"   [green]✅ WhatsApp: {club.total_messages:,} messages, {club.num_participants} participants[/green]")
+            if club.duplicate_messages:
+                console.print(f"   [dim]♻️  Merged {len(club.whatsapp_files)} exports, skipped {club.duplicate_messages:,} duplicate messages ({club.duplicate_bytes / 1024:,.1f} KB)[/dim]")
+        else:
+            club_ok = False
+            console.print(f"   [red]❌ Failed to parse WhatsApp chat[/red]")
+    except Exception as e:
+        club_ok = False
+        console.print(f"   [red]❌ WhatsApp error: {e}[/red]")
+
+    console.print(f"[orange3]📊 Computing metrics and scores...[/orange3]")
+    try:
+        club_metrics = {
+            'num_posts': club.num_posts,
+            'likes_sum': club.likes_sum,
+            'comments_sum': club.comments_sum,
+            'followers': club.followers,
+            'total_messages': club.total_messages,
+            'num_participants': club.num_participants,
+            'post_dates': club.post_dates
+        }
+
+        events = cluster_posts_into_events(club.post_dates)
+        bursts = cluster_announcements_into_bursts(club.announcement_dates)
+        club.events = corroborate_events(events, bursts)
+
+        club.composite_score = compute_final_score_with_events(club_metrics, events)
+
+        num_corroborated = sum(1 for e in events if e['corroborated'])
+        console.print(f"   [green]✅ Score: {club.composite_score:.2f}, Events: {len(events)} ({num_corroborated} announced on WhatsApp)[/green]")
+
+    except Exception as e:
+        club_ok = False
+        console.print(f"   [red]❌ Metrics computation error: {e}[/red]")
+
+    if club_ok:
+        try:
+            save_club_checkpoint(club, checkpoint_dir)
+        except OSError as e:
+            console.print(f"   [red]❌ Checkpoint write error: {e}[/red]")
+
+    return club_ok
@@ -0,0 +1,257 @@
+import argparse
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from rich.console import Console
+
+from club import Club
+from checkpoint import CHECKPOINT_DIR, club_to_checkpoint, load_club_checkpoint
+from grouping import CategoryIndex, category_path
+from metrics import normalize_scores
+from pipeline import build_clubs, process_club
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+class ClubService:
+    """Keeps clubs, scores and the category index warm in memory and serves them as cached JSON.
+
+    Responses are cached per resource with an ETag. Refreshing one club only
+    drops the cached responses it can have changed: the rankings, the clubs
+    whose normalized score or rank moved, and the categories they belong to.
+    """
+
+    def __init__(self, clubs: List[Club], console: Console, checkpoint_dir: str = CHECKPOINT_DIR):
+        self.clubs = clubs
+        self.console = console
+        self.checkpoint_dir = checkpoint_dir
+        self.category_index = CategoryIndex()
+        self._lock = threading.RLock()
+        self._cache: Dict[Tuple, Tuple[str, bytes]] = {}  # resource -> (etag, body)
+        self._refreshing: set = set()
+
+    def load(self, resume: bool = False):
+        for club in self.clubs:
+            if resume and load_club_checkpoint(club, self.checkpoint_dir):
+                self.console.print(f"[green]♻️  {club.name}: loaded from checkpoint[/green]")
+            else:
+                process_club(club, self.console, self.checkpoint_dir)
+        with self._lock:
+            for club in self.clubs:
+                self.category_index.add(club)
+            self._renormalize()
+
+    def find_club(self, key: str) -> Optional[Club]:
+        key = key.strip().lower()
+        for club in self.clubs:
+            if club.insta_handle.lower() == key or club.name.strip().lower() == key:
+                return club
+        return None
+
+    def _renormalize(self) -> List[Club]:
+        """Recompute normalized scores, returning the clubs whose score changed"""
+        normalized = normalize_scores([club.composite_score for club in self.clubs])
+        changed = []
+        for club, score in zip(self.clubs, normalized):
+            if score != club.normalized_score:
+                self.category_index.update_score(club, score)
+                changed.append(club)
+        return changed
+
+    def _invalidate(self, clubs: List[Club]):
+        self._cache.pop(('rankings',), None)
+        for club in clubs:
+            self._cache.pop(('club', club.insta_handle), None)
+            for category in category_path(club.category):
+                self._cache.pop(('category', category), None)
+
+    def start_refresh(self, club: Club) -> bool:
+        with self._lock:
+            if club.insta_handle in self._refreshing:
+                return False
+            self._refreshing.add(club.insta_handle)
+        threading.Thread(target=self._refresh, args=(club,), daemon=True).start()
+        return True
+
+    def _refresh(self, club: Club):
+        # Fetch into a fresh Club so readers never see a half-updated one, then swap it in
+        fresh = Club(club.name, club.insta_handle, club.whatsapp_file, club.category)
+        try:
+            if not process_club(fresh, self.console, self.checkpoint_dir):
+                self.console.print(f"[red]❌ Refresh of {club.name} failed, keeping previous data[/red]")
+                return
+            with self._lock:
+                old_ranks = {c.insta_handle: rank for rank, c in enumerate(self._ranked())}
+                self.clubs[self.clubs.index(club)] = fresh
+                self.category_index.remove(club)
+                fresh.normalized_score = club.normalized_score
+                self.category_index.add(fresh)
+                changed = [fresh] + self._renormalize()
+                # A club's rank can move without its own score changing
+                changed += [c for rank, c in enumerate(self._ranked()) if old_ranks[c.insta_handle] != rank]
+                self._invalidate(changed)
+        finally:
+            with self._lock:
+                self._refreshing.discard(club.insta_handle)
+
+    def _ranked(self) -> List[Club]:
+        return sorted(self.clubs, key=lambda c: c.normalized_score, reverse=True)
+
+    def _club_payload(self, club: Club) -> Dict:
+        payload = club_to_checkpoint(club)
+        del payload['whatsapp_files']  # local file paths are nobody's business over HTTP
+        del payload['whatsapp']['member_minhash'], payload['whatsapp']['member_hll']
+        # Day-level series belong to the activity cube, not every club response
+        del payload['whatsapp']['daily_messages'], payload['whatsapp']['daily_active_senders']
+        payload.update({
+            'name': club.name.strip(),
+            'category': club.category,
+            'rank': self._ranked().index(club) + 1,
+            'normalized_score': club.normalized_score
+        })
+        return payload
+
+    def _build(self, resource: Tuple):
+        kind = resource[0]
+        if kind == 'rankings':
+            return [
+                {
+                    'rank': rank,
+                    'name': club.name.strip(),
+                    'insta_handle': club.insta_handle,
+                    'category': club.category,
+                    'normalized_score': club.normalized_score,
+                    'composite_score': club.composite_score
+                }
+                for rank, club in enumerate(self._ranked(), 1)
+            ]
+        if kind == 'club':
+            return self._club_payload(self.find_club(resource[1]))
+        if kind == 'category':
+            stats = self.category_index[resource[1]]
+            top = stats.top
+            prefix = resource[1] + "/"
+            return {
+                'category': stats.name,
+                'count': stats.count,
+                'mean_score': stats.mean,
+                'top_club': top.insta_handle if top else None,
+                'clubs': [
+                    {'name': c.name.strip(), 'insta_handle': c.insta_handle, 'normalized_score': c.normalized_score}
+                    for c in stats.clubs
+                ],
+                'subcategories': [
+                    name for name in self.category_index.categories()
+                    if name.startswith(prefix) and "/" not in name[len(prefix):]
+                ]
+            }
+        raise KeyError(resource)
+
+    def get(self, resource: Tuple) -> Tuple[str, bytes]:
+        with self._lock:
+            cached = self._cache.get(resource)
+            if cached is None:
+                body = json.dumps(self._build(resource), ensure_ascii=False, indent=2).encode('utf-8')
+                etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+                cached = self._cache[resource] = (etag, body)
+            return cached
+
+class ClubRequestHandler(BaseHTTPRequestHandler):
+    """GET /rankings, /clubs/<handle>, /categories/<path>; POST /clubs/<handle>/refresh"""
+
+    server_version = "ClubAnalyser"
+
+    @property
+    def service(self) -> ClubService:
+        return self.server.service
+
+    def _send_json(self, status: int, payload, etag: Optional[str] = None):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _resource(self, path: str) -> Optional[Tuple]:
+        parts = [unquote(p) for p in path.strip("/").split("/") if p]
+        if parts == ['rankings']:
+            return ('rankings',)
+        if len(parts) == 2 and parts[0] == 'clubs':
+            club = self.service.find_club(parts[1])
+            return ('club', club.insta_handle) if club else None
+        if len(parts) >= 2 and parts[0] == 'categories':
+            category = "/".join(parts[1:])
+            return ('category', category) if category in self.service.category_index else None
+        return None
+
+    def do_GET(self):
+        resource = self._resource(urlsplit(self.path).path)
+        if resource is None:
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        etag, body = self.service.get(resource)
+        if_none_match = self.headers.get("If-None-Match", "")
+        if if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self._send_json(200, body, etag)
+
+    def do_POST(self):
+        parts = [unquote(p) for p in urlsplit(self.path).path.strip("/").split("/") if p]
+        if len(parts) != 3 or parts[0] != 'clubs' or parts[2] != 'refresh':
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        club = self.service.find_club(parts[1])
+        if club is None:
+            self._send_json(404, {'error': 'unknown club'})
+        elif self.service.start_refresh(club):
+            self._send_json(202, {'status': 'refreshing', 'club': club.insta_handle})
+        else:
+            self._send_json(409, {'status': 'already refreshing', 'club': club.insta_handle})
+
+    def log_message(self, format, *args):
+        self.service.console.print(f"[dim]🌐 {self.address_string()} {format % args}[/dim]")
+
+def serve(clubs: List[Club], host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+          resume: bool = False, checkpoint_dir: str = CHECKPOINT_DIR, console: Optional[Console] = None):
+    """Load the club set once and serve it over a local JSON API until interrupted"""
+    if console is None:
+        console = Console()
+
+    service = ClubService(clubs, console, checkpoint_dir)
+    service.load(resume=resume)
+
+    httpd = ThreadingHTTPServer((host, port), ClubRequestHandler)
+    httpd.service = service
+    console.print(f"[bold green]🚀 Serving {len(clubs)} clubs on http://{host}:{port}[/bold green]")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        console.print("[yellow]👋 Shutting down[/yellow]")
+    finally:
+        httpd.server_close()
+
+if __name__ == "__main__":
+    # Starting here rather than via main.py --serve skips the plotting imports the service never uses
+    parser = argparse.ArgumentParser(description="Serve club rankings over a local JSON API")
+    parser.add_argument("--resume", action="store_true",
+                        help="load clubs already checkpointed by a previous run instead of fetching them")
+    parser.add_argument("--checkpoint-dir", default=CHECKPOINT_DIR,
+                        help=f"where per-club checkpoints are written (default: {CHECKPOINT_DIR})")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="address to bind")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to listen on")
+    args = parser.parse_args()
+
+    serve(build_clubs(), host=args.host, port=args.port, resume=args.resume, checkpoint_dir=args.checkpoint_dir)
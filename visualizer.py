@@ -1,7 +1,11 @@
+import heapq
 import matplotlib.pyplot as plt
 import numpy as np
 from typing import List, Optional
 from club import Club
+from grouping import CategoryIndex
+from activity import ActivityCube, METRICS
+from sketches import MINHASH_SLOTS, jaccard_matrix, estimate_shared, distinct_members, minhash_error
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
@@ -13,7 +17,7 @@ def create_club_visualizations(clubs: List[Club]):
     """Create comprehensive visualizations for club analysis"""
     
     #We start by setting up the matplotlib method of analysing and setting up functionsa fucntion for our matplotlib here
-        plt.style.use('default')
+    plt.style.use('default')
     fig = plt.figure(figsize=(16, 12))
     
     # ExtractOver here I'm extracting data for plotting
@@ -130,10 +134,12 @@ def create_club_visualizations(clubs: List[Club]):
     plt.tight_layout()
     return fig
 
-def print_terminal_summary(clubs: List[Club], console: Optional[Console] = None):
+def print_terminal_summary(clubs: List[Club], console: Optional[Console] = None, category_index: Optional[CategoryIndex] = None):
     """Print a clean terminal summary of club rankings using Rich"""
     if console is None:
         console = Console()
+    if category_index is None:
+        category_index = CategoryIndex(clubs)
     
     # Sort clubs by normalized score
     sorted_clubs = sorted(clubs, key=lambda c: c.normalized_score, reverse=True)
@@ -168,13 +174,16 @@ def print_terminal_summary(clubs: List[Club], console: Optional[Console] = None)
     for i, club in enumerate(sorted_clubs, 1):
         engagement_rate = ((club.likes_sum + club.comments_sum) / club.followers * 100) if club.followers > 0 else 0
         rank_emoji = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else "🏅"
+        whatsapp_cell = f"{club.total_messages:,} messages\n{club.num_participants} participants"
+        if club.duplicate_messages:
+            whatsapp_cell += f"\n{club.duplicate_messages:,} duplicates skipped ({club.duplicate_bytes / 1024:,.1f} KB)"
         
         detailed_table.add_row(
             f"{rank_emoji} {i}",
             club.name,
             f"{club.normalized_score:.3f}",
             f"{club.followers:,} followers\n{club.num_posts} posts",
-            f"{club.total_messages:,} messages\n{club.num_participants} participants",
+            whatsapp_cell,
             f"{engagement_rate:.1f}%"
         )
     
@@ -182,12 +191,6 @@ def print_terminal_summary(clubs: List[Club], console: Optional[Console] = None)
     console.print()
     
     # Category breakdown
-    categories = {}
-    for club in clubs:
-        if club.category not in categories:
-            categories[club.category] = []
-        categories[club.category].append(club)
-    
     category_summary_table = Table(
         title="📂 CATEGORY BREAKDOWN",
         title_style="bold bright_green",
@@ -200,18 +203,134 @@ def print_terminal_summary(clubs: List[Club], console: Optional[Console] = None)
     category_summary_table.add_column("Average Score", style="green", justify="right")
     category_summary_table.add_column("Top Club", style="white")
     
-    for category, category_clubs in categories.items():
-        avg_score = sum(c.normalized_score for c in category_clubs) / len(category_clubs)
-        top_club = max(category_clubs, key=lambda c: c.normalized_score)
+    for category in category_index.categories():
+        stats = category_index[category]
+        top_club = stats.top
         
         category_summary_table.add_row(
             f"🏷️ {category.upper()}",
-            str(len(category_clubs)),
-            f"{avg_score:.3f}",
+            str(stats.count),
+            f"{stats.mean:.3f}",
             f"{top_club.name} ({top_club.normalized_score:.3f})"
         )
     
     console.print(category_summary_table)
+
+def print_membership_overlap(clubs: List[Club], console: Optional[Console] = None, category_index: Optional[CategoryIndex] = None, top_n: int = 10):
+    """Print the most overlapping club pairs and distinct members per category"""
+    if console is None:
+        console = Console()
+    sketched = [club for club in clubs if club.member_minhash and club.member_hll]
+    if not sketched:
+        return
+    if category_index is None:
+        category_index = CategoryIndex(clubs)
+
+    # Only the strongest pairs are shown; a full club x club grid is unreadable past a handful of clubs
+    matrix = jaccard_matrix([club.member_minhash for club in sketched])
+    pairs = heapq.nlargest(
+        top_n,
+        ((matrix[i][j], i, j) for i in range(len(sketched)) for j in range(i + 1, len(sketched))),
+        key=lambda pair: pair[0]
+    )
+
+    overlap_table = Table(
+        title=f"🤝 TOP {len(pairs)} MEMBERSHIP OVERLAPS",
+        title_style="bold bright_magenta",
+        border_style="bright_magenta",
+        box=box.ROUNDED
+    )
+    overlap_table.add_column("Club", style="bold white")
+    overlap_table.add_column("Club", style="bold white")
+    overlap_table.add_column("Jaccard", style="cyan", justify="right")
+    overlap_table.add_column("Est. Shared Members", style="green", justify="right")
+
+    for jaccard, i, j in pairs:
+        shared = estimate_shared(jaccard, sketched[i].num_participants, sketched[j].num_participants)
+        overlap_table.add_row(
+            sketched[i].name.strip(),
+            sketched[j].name.strip(),
+            f"{jaccard * 100:.1f}% ± {minhash_error(jaccard) * 100:.1f}",
+            f"~{shared:,.0f}"
+        )
+
+    console.print(overlap_table)
+    console.print(f"[dim]Jaccard from {MINHASH_SLOTS}-slot MinHash, ± one standard error (at most {minhash_error(0.5) * 100:.1f} points)[/dim]")
+    console.print()
+
+    distinct_table = Table(
+        title="🎓 DISTINCT MEMBERS",
+        title_style="bold bright_magenta",
+        border_style="bright_magenta",
+        box=box.ROUNDED
+    )
+    distinct_table.add_column("Category", style="bold bright_yellow")
+    distinct_table.add_column("Sum of Club Sizes", style="dim", justify="right")
+    distinct_table.add_column("Distinct Members", style="green", justify="right")
+
+    relative_error = sketched[0].member_hll.relative_error
+    for category in category_index.categories():
+        category_clubs = [c for c in category_index[category].clubs if c.member_hll]
+        if not category_clubs:
+            continue
+        distinct = distinct_members(c.member_hll for c in category_clubs)
+        distinct_table.add_row(
+            f"🏷️ {category.upper()}",
+            f"{sum(c.num_participants for c in category_clubs):,}",
+            f"~{distinct:,.0f} ± {distinct * relative_error:,.0f}"
+        )
+    distinct = distinct_members(c.member_hll for c in sketched)
+    distinct_table.add_row(
+        "[bold]ALL CLUBS[/bold]",
+        f"{sum(c.num_participants for c in sketched):,}",
+        f"[bold]~{distinct:,.0f} ± {distinct * relative_error:,.0f}[/bold]"
+    )
+
+    console.print(distinct_table)
+    console.print(f"[dim]Distinct counts from HyperLogLog: ±{relative_error:.1%} (1σ)[/dim]")
+    console.print()
+
+def create_activity_timeline(cube: ActivityCube, bin_days: int = 7):
+    """Plot every activity metric over time, one line per club, from the precomputed cube"""
+    fig, axes = plt.subplots(len(METRICS), 1, figsize=(16, 3 * len(METRICS)), sharex=True)
+    colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4']
+
+    # Sum whole bins of days with a reshape instead of looping over dates
+    num_bins = cube.num_days // bin_days
+    dates = cube.dates()[:num_bins * bin_days:bin_days]
+
+    for m, (metric, ax) in enumerate(zip(METRICS, axes)):
+        binned = np.asarray(cube.data[m, :, :num_bins * bin_days]).reshape(len(cube.club_keys), num_bins, bin_days).sum(axis=2)
+        for c, name in enumerate(cube.club_names):
+            ax.plot(dates, binned[c], linewidth=1.5, label=name[:12], color=colors[c % len(colors)])
+        ax.set_title(f"{metric.replace('_', ' ').title()} per {bin_days} days", fontweight='bold')
+        ax.set_ylabel(metric.replace('_', ' ').title())
+
+    axes[0].legend(bbox_to_anchor=(1.01, 1), loc='upper left')
+    axes[-1].set_xlabel('Date')
+    plt.tight_layout()
+    return fig
+
+def save_activity_timeline(cube: ActivityCube, filename: str = "club_activity_timeline.png", console: Optional[Console] = None):
+    """Save the activity timeline chart to file"""
+    if console is None:
+        console = Console()
+    if cube.num_days == 0:
+        return None
+
+    fig = create_activity_timeline(cube)
+    fig.savefig(filename, dpi=200, bbox_inches='tight')
+    plt.close(fig)
+
+    save_panel = Panel(
+        f"[green]📈 Activity timeline saved to: [bold]{filename}[/bold][/green]",
+        title="[bold blue]File Saved[/bold blue]",
+        border_style="green",
+        box=box.SIMPLE
+    )
+    console.print(save_panel)
+    return filename
+
 # for adding and sending thesevisualisation straight in a PNG format within our folder
 def save_visualizations(clubs: List[Club], filename: str = "club_analysis.png", console: Optional[Console] = None):
     """Save visualizations to file"""
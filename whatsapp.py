@@ -1,18 +1,102 @@
-from datetime import datetime
-from typing import Dict
+from datetime import date, datetime, timedelta
+from typing import Dict, IO, Iterator, List, Optional, Tuple, Union
+from contextlib import contextmanager
+import gzip
+import hashlib
+import heapq
+import io
+import os
 import re
+import zipfile
 
-def parse_whatsapp_chat(file_path: str) -> Dict:
-    messages = []
-    participants = set()
-    dates = []
+from sketches import MinHash, HyperLogLog
+from announcements import DEFAULT_ANNOUNCEMENT_KEYWORDS, build_automaton
+
+ZIP_MAGIC = b'PK\x03\x04'
+GZIP_MAGIC = b'\x1f\x8b'
+
+# How far behind the newest message a late-arriving one (sent while its sender was offline)
+# can still be matched against the other exports' copies of it
+DEDUPE_LOOKBACK = timedelta(hours=6)
+
+def find_chat_member(zf: zipfile.ZipFile) -> str:
+    """Pick the chat transcript out of a WhatsApp "Export Chat" archive"""
+    txt_members = [
+        info for info in zf.infolist()
+        if not info.is_dir() and info.filename.lower().endswith('.txt')
+        and not info.filename.startswith('__MACOSX/')
+        and not os.path.basename(info.filename).startswith('.')
+    ]
+    if not txt_members:
+        raise ValueError(f"No chat .txt file found in {zf.filename}")
+
+    # iOS names it _chat.txt, Android "WhatsApp Chat with <group>.txt"; otherwise take the biggest text file
+    for info in txt_members:
+        name = os.path.basename(info.filename)
+        if name == '_chat.txt' or name.startswith('WhatsApp Chat'):
+            return info.filename
+    return max(txt_members, key=lambda info: info.file_size).filename
+
+@contextmanager
+def open_chat_export(file_path: str) -> Iterator[IO[str]]:
+    """Open a plain, zipped or gzipped chat export as a text stream without extracting it to disk"""
+    with open(file_path, 'rb') as raw:
+        magic = raw.read(4)
 
-    
-    pattern = re.compile(r'(\d{1,2}/\d{1,2}/\d{2,4}), (\d{1,2}:\d{2} (?:AM|PM)) - (.*?): (.*)')
+    if magic.startswith(ZIP_MAGIC):
+        with zipfile.ZipFile(file_path) as zf:
+            with zf.open(find_chat_member(zf)) as member:
+                yield io.TextIOWrapper(member, encoding='utf-8')
+    elif magic.startswith(GZIP_MAGIC):
+        with gzip.open(file_path, 'rt', encoding='utf-8') as f:
+            yield f
+    else:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            yield f
 
-    with open(file_path, 'r', encoding='utf-8') as f:
+# Android: "12/25/2023, 2:05 PM - Sender: text"    iOS: "[25/12/23, 14:05:32] Sender: text" (or month-first,
+# "[12/25/23, 2:05:32 PM]", on US-locale phones)
+MESSAGE_PATTERN = re.compile(r'(\d{1,2}/\d{1,2}/\d{2,4}), (\d{1,2}:\d{2} (?:AM|PM)) - (.*?): (.*)')
+IOS_MESSAGE_PATTERN = re.compile(r'\u200e?\[(\d{1,2}/\d{1,2}/\d{2,4}), (\d{1,2}:\d{2}:\d{2}(?:\s?[AP]M)?)\] (.*?): (.*)')
+
+def _ios_day_first(file_path: str) -> bool:
+    """Whether an iOS export writes its dates day-first; the phone's locale decides, so look for a field above 12"""
+    with open_chat_export(file_path) as f:
+        for line in f:
+            match = IOS_MESSAGE_PATTERN.match(line)
+            if match:
+                first, second = match.group(1).split('/')[:2]
+                if int(first) > 12:
+                    return True
+                if int(second) > 12:
+                    return False
+    # No date settles it (every day of the chat is the 12th or earlier); most locales are day-first
+    return True
+
+def _parse_timestamp(date_str: str, time_str: str, ios: bool, day_first: bool = True) -> datetime:
+    if not ios:
+        return datetime.strptime(f"{date_str} {time_str}", "%m/%d/%Y %I:%M %p")
+    year = "%Y" if len(date_str.rsplit('/', 1)[1]) == 4 else "%y"
+    clock = "%I:%M:%S %p" if time_str.endswith("M") else "%H:%M:%S"
+    time_str = time_str.replace("\u202f", " ").replace("\xa0", " ")
+    if clock.endswith("%p") and " " not in time_str:
+        time_str = time_str[:-2] + " " + time_str[-2:]
+    order = "%d/%m" if day_first else "%m/%d"
+    return datetime.strptime(f"{date_str} {time_str}", f"{order}/{year} {clock}")
+
+def iter_chat_messages(file_path: str) -> Iterator[Tuple[datetime, str, str, str]]:
+    """Yield (datetime, sender, message, raw line) for each user message in one export, in file order"""
+    last_stamp, last_dt = None, None
+    day_first = None  # iOS date order, worked out from the whole file on the first iOS line
+    with open_chat_export(file_path) as f:
         for line in f:
-            match = pattern.match(line)
+            match = MESSAGE_PATTERN.match(line)
+            ios = False
+            if not match:
+                match = IOS_MESSAGE_PATTERN.match(line)
+                ios = match is not None
+                if ios and day_first is None:
+                    day_first = _ios_day_first(file_path)
             if match:
                 date_str, time_str, sender, message = match.groups()
                 
@@ -20,20 +104,262 @@ def parse_whatsapp_chat(file_path: str) -> Dict:
                 if message.strip().lower().endswith(("joined using this group's invite link", "was added")):
                     continue
 
-                dt = datetime.strptime(f"{date_str} {time_str}", "%m/%d/%Y %I:%M %p")
-                dates.append(dt)
-                participants.add(sender)
-                messages.append({'sender': sender, 'datetime': dt, 'message': message})
+                # Consecutive messages usually share a minute, so skip re-parsing the same timestamp
+                stamp = (date_str, time_str)
+                if stamp != last_stamp:
+                    last_stamp = stamp
+                    last_dt = _parse_timestamp(date_str, time_str, ios, day_first)
+                yield last_dt, sender, message, line
+
+def _message_key(sender: str, message: str) -> int:
+    # 8-byte digest keeps the dedupe index small no matter how long messages are
+    digest = hashlib.blake2b(f"{sender}\0{message}".encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+def merge_chat_exports(file_paths: List[str], stats: Optional[Dict] = None) -> Iterator[Tuple[datetime, str, str]]:
+    """Merge overlapping exports of the same chat into one deduplicated, time-ordered stream.
+
+    Exports list messages in arrival order, which is time order apart from the
+    odd message sent while offline. The exports are merged as runs, and the
+    (minute, sender, message-hash) keys are held for DEDUPE_LOOKBACK behind the
+    newest minute seen; kept messages are held as long and released in time
+    order. A message later than that may slip through as a duplicate or out of
+    order. Keys use the minute because Android timestamps have no seconds.
+
+    A message is kept as many times as the export containing it most often has
+    it, so repeated "ok"s within one export survive while copies from other
+    exports are dropped. Skipped counts are written into stats.
+    """
+    if stats is None:
+        stats = {}
+    stats.setdefault('duplicate_messages', 0)
+    stats.setdefault('duplicate_bytes', 0)
+
+    def tagged_run(source: int, path: str):
+        for dt, sender, message, line in iter_chat_messages(path):
+            yield dt, source, sender, message, line
+
+    runs = [tagged_run(source, path) for source, path in enumerate(file_paths)]
+
+    # minute -> ((key, source) -> occurrences, key -> copies emitted)
+    buckets: Dict[datetime, Tuple[Dict[Tuple[int, int], int], Dict[int, int]]] = {}
+    expiry: List[datetime] = []  # heap of the minutes in buckets
+    pending: List[Tuple[datetime, int, str, str]] = []  # heap of kept messages not yet released
+    latest = None
+    for order, (dt, source, sender, message, line) in enumerate(heapq.merge(*runs, key=lambda item: item[0])):
+        minute = dt.replace(second=0, microsecond=0)
+        if latest is None or minute > latest:
+            latest = minute
+            horizon = latest - DEDUPE_LOOKBACK
+            while expiry and expiry[0] < horizon:
+                del buckets[heapq.heappop(expiry)]
+            while pending and pending[0][0] < horizon:
+                released, _, released_sender, released_message = heapq.heappop(pending)
+                yield released, released_sender, released_message
+
+        bucket = buckets.get(minute)
+        if bucket is None:
+            bucket = buckets[minute] = ({}, {})
+            heapq.heappush(expiry, minute)
+        seen, kept = bucket
+
+        key = _message_key(sender, message)
+        count = seen.get((key, source), 0) + 1
+        seen[(key, source)] = count
+        if count > kept.get(key, 0):
+            kept[key] = count
+            heapq.heappush(pending, (dt, order, sender, message))
+        else:
+            stats['duplicate_messages'] += 1
+            stats['duplicate_bytes'] += len(line.encode('utf-8'))
+
+    while pending:
+        released, _, released_sender, released_message = heapq.heappop(pending)
+        yield released, released_sender, released_message
+
+def parse_whatsapp_chat(file_path: Union[str, List[str]], keywords: Tuple[str, ...] = DEFAULT_ANNOUNCEMENT_KEYWORDS) -> Dict:
+    # Only running aggregates are kept, so memory does not grow with the number of messages
+    total_messages = 0
+    participants = set()
+    first_msg, last_msg = None, None
+    announcement_dates = []
+    daily_messages: Dict[date, int] = {}
+    daily_senders: Dict[date, set] = {}
 
-    total_messages = len(messages)
-    num_participants = len(participants)
-    first_msg = min(dates) if dates else None
-    last_msg = max(dates) if dates else None
+    file_paths = [file_path] if isinstance(file_path, str) else list(file_path)
+    merge_stats: Dict = {'duplicate_messages': 0, 'duplicate_bytes': 0}
+    if len(file_paths) == 1:
+        # One export has no cross-export duplicates, so skip the merge and hashing
+        messages = ((dt, sender, message) for dt, sender, message, _ in iter_chat_messages(file_paths[0]))
+    else:
+        messages = merge_chat_exports(file_paths, merge_stats)
+    # One automaton scan per message finds every announcement keyword at once
+    automaton = build_automaton(tuple(keywords))
+
+    for dt, sender, message in messages:
+        total_messages += 1
+        participants.add(sender)
+        if first_msg is None or dt < first_msg:
+            first_msg = dt
+        if last_msg is None or dt > last_msg:
+            last_msg = dt
+        day = dt.date()
+        daily_messages[day] = daily_messages.get(day, 0) + 1
+        daily_senders.setdefault(day, set()).add(sender)
+        if automaton.find(message):
+            announcement_dates.append(dt)
+
+    if total_messages == 0:
+        # An unrecognised line format would otherwise look like a silent, successful parse
+        raise ValueError(f"No WhatsApp messages recognised in {', '.join(file_paths)}")
+
+    # Fixed-size stand-ins for the participant set, for cross-club overlap without keeping names around
+    member_minhash = MinHash()
+    member_minhash.update(participants)
+    member_hll = HyperLogLog()
+    member_hll.update(participants)
 
     return {
         'total_messages': total_messages,
-        'num_participants': num_participants,
+        'num_participants': len(participants),
         'first_msg_date': first_msg,
         'last_msg_date': last_msg,
-        'messages': messages
+        'duplicate_messages': merge_stats['duplicate_messages'],
+        'duplicate_bytes': merge_stats['duplicate_bytes'],
+        'member_minhash': member_minhash,
+        'member_hll': member_hll,
+        'announcement_dates': announcement_dates,
+        'daily_messages': daily_messages,
+        'daily_active_senders': {day: len(senders) for day, senders in daily_senders.items()}
     }
+
+if __name__ == '__main__':
+    import random
+    import tempfile
+    import time
+    from collections import Counter
+
+    print("--- Deduplicating merge against exact answers ---") # for testing purposes
+
+    def to_minute(dt):
+        return dt.replace(second=0, microsecond=0)
+
+    def exact_merge(paths):
+        # Reference answer: every (minute, sender, text) kept as often as the export that has it most
+        per_export = [Counter((to_minute(dt), sender, msg) for dt, sender, msg, _ in iter_chat_messages(p)) for p in paths]
+        expected = Counter()
+        for counts in per_export:
+            expected |= counts
+        total_lines = sum(sum(counts.values()) for counts in per_export)
+        return expected, total_lines - sum(expected.values())
+
+    def check_merge(label, paths):
+        stats = {}
+        merged = list(merge_chat_exports(paths, stats))
+        expected, expected_dupes = exact_merge(paths)
+        assert Counter((to_minute(dt), sender, msg) for dt, sender, msg in merged) == expected, \
+            f"{label}: merged messages differ from exact answer"
+        assert stats['duplicate_messages'] == expected_dupes, f"{label}: duplicate count {stats['duplicate_messages']} != {expected_dupes}"
+        assert [m[0] for m in merged] == sorted(m[0] for m in merged), f"{label}: output not in time order"
+        print(f"{label}: kept {len(merged)}, skipped {stats['duplicate_messages']} duplicates ({stats['duplicate_bytes']} bytes)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def write_export(name, lines):
+            path = os.path.join(tmp, name)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.writelines(line + "\n" for line in lines)
+            return path
+
+        # Two phones exporting overlapping date ranges of the same group
+        chat = [f"1/{day}/2024, 10:{minute:02d} AM - Member {minute % 7}: update {day}-{minute}"
+                for day in range(1, 16) for minute in range(0, 60, 15)]
+        phone_a = write_export('phone_a.txt', chat[:40])
+        phone_b = write_export('phone_b.txt', chat[20:])
+        check_merge("overlapping exports", [phone_a, phone_b])
+
+        # Real repeats in one export survive; the other export's copy of them is dropped
+        repeats_a = write_export('repeats_a.txt', ["2/1/2024, 9:00 AM - Asha: ok", "2/1/2024, 9:00 AM - Asha: ok",
+                                                   "2/1/2024, 9:00 AM - Ravi: ok", "2/1/2024, 9:01 AM - Asha: ok"])
+        repeats_b = write_export('repeats_b.txt', ["2/1/2024, 9:00 AM - Asha: ok", "2/1/2024, 9:01 AM - Asha: ok",
+                                                   "2/1/2024, 9:01 AM - Asha: ok"])
+        check_merge("repeats within an export", [repeats_a, repeats_b])
+        kept = Counter(merge_chat_exports([repeats_a, repeats_b]))
+        assert kept[(datetime(2024, 2, 1, 9, 0), 'Asha', 'ok')] == 2
+        assert kept[(datetime(2024, 2, 1, 9, 1), 'Asha', 'ok')] == 2
+
+        # A file merged with itself adds nothing
+        check_merge("file merged with itself", [phone_a, phone_a])
+        assert parse_whatsapp_chat([phone_a, phone_a])['total_messages'] == parse_whatsapp_chat(phone_a)['total_messages']
+
+        # A message sent while offline is listed where it arrived, behind newer ones
+        late = write_export('late.txt', ["4/1/2024, 2:05 PM - Asha: venue?", "4/1/2024, 2:06 PM - Ravi: hall B",
+                                         "4/1/2024, 2:01 PM - Meera: running late", "4/1/2024, 2:07 PM - Asha: thanks"])
+        check_merge("out-of-order export merged with itself", [late, late])
+        stats = {}
+        assert len(list(merge_chat_exports([late, late], stats))) == 4 and stats['duplicate_messages'] == 4
+
+        # The same group exported from an Android phone and an iPhone; only iOS has seconds
+        android = write_export('android.txt', ["1/5/2024, 2:05 PM - Asha: venue?", "1/5/2024, 2:05 PM - Ravi: hall B"])
+        iphone = write_export('iphone.txt', ["[05/01/24, 14:05:32] Asha: venue?", "[05/01/24, 14:05:51] Ravi: hall B",
+                                             "[13/01/24, 09:00:00] Asha: thanks"])
+        check_merge("Android and iOS exports", [android, iphone])
+        stats = {}
+        assert len(list(merge_chat_exports([android, iphone], stats))) == 3 and stats['duplicate_messages'] == 2
+
+        # Random overlapping slices of one chat with plenty of same-minute repeats
+        rng = random.Random(7)
+        chat = sorted((rng.randrange(1, 29), rng.randrange(0, 3)) for _ in range(3000))
+        chat = [f"3/{day}/2024, 8:0{minute} PM - Member {rng.randrange(4)}: {rng.choice(['ok', 'yes', 'hi'])}"
+                for day, minute in chat]
+        slices = []
+        for i in range(4):
+            lo = rng.randrange(0, len(chat) // 2)
+            slices.append(write_export(f'slice_{i}.txt', chat[lo:lo + rng.randrange(500, 1500)]))
+        check_merge("random overlapping slices", slices)
+
+        # iOS date order follows the phone's locale and is read off the file
+        ios_dates = {
+            'ios_day_first.txt': ["[01/02/24, 09:15:00] Asha: hi", "[13/02/24, 09:16:10] Ravi: hello"],
+            'ios_month_first.txt': ["[01/02/24, 9:15:00 AM] Asha: hi", "[12/25/23, 2:05:32 PM] Ravi: hello"]
+        }
+        expected_dates = {
+            'ios_day_first.txt': [datetime(2024, 2, 1, 9, 15), datetime(2024, 2, 13, 9, 16, 10)],
+            'ios_month_first.txt': [datetime(2024, 1, 2, 9, 15), datetime(2023, 12, 25, 14, 5, 32)]
+        }
+        for name, lines in ios_dates.items():
+            parsed = [dt for dt, _, _, _ in iter_chat_messages(write_export(name, lines))]
+            assert parsed == expected_dates[name], f"{name}: parsed {parsed}"
+        print("iOS exports: day-first and month-first dates parsed")
+
+    # Throughput of streaming zip/gzip exports against the plain text file, on a synthetic chat
+
+    num_lines = 200_000
+    senders = [f"Member {i}" for i in range(150)]
+    words = "registrations open venue workshop tomorrow see you all there thanks".split()
+    random.seed(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plain_path = os.path.join(tmp, 'chat.txt')
+        with open(plain_path, 'w', encoding='utf-8') as f:
+            for i in range(num_lines):
+                day = 1 + (i // 2000) % 28
+                month = 1 + (i // 56000) % 12
+                f.write(f"{month}/{day}/2024, {1 + i % 12}:{i % 60:02d} {'AM' if i % 2 else 'PM'} - "
+                        f"{random.choice(senders)}: {' '.join(random.choices(words, k=8))}\n")
+
+        gz_path = os.path.join(tmp, 'chat.txt.gz')
+        with open(plain_path, 'rb') as src, gzip.open(gz_path, 'wb') as dst:
+            dst.write(src.read())
+
+        zip_path = os.path.join(tmp, 'WhatsApp Chat with Bench.zip')
+        with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+            zf.write(plain_path, 'WhatsApp Chat with Bench.txt')
+
+        size_mb = os.path.getsize(plain_path) / 1e6
+        print(f"--- {num_lines:,} lines, {size_mb:.1f} MB uncompressed ---")
+        for label, path in (('plain', plain_path), ('gzip', gz_path), ('zip', zip_path)):
+            start = time.perf_counter()
+            result = parse_whatsapp_chat(path)
+            elapsed = time.perf_counter() - start
+            print(f"{label:>6}: {elapsed:.2f}s  {size_mb / elapsed:6.1f} MB/s  "
+                  f"{result['total_messages']:,} messages  ({os.path.getsize(path) / 1e6:.1f} MB on disk)")